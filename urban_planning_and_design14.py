@@ -1,44 +1,27 @@
+import collections
 import streamlit as st
-import pandas as pd
 import time
 
+from zoning_core import CHAT_INPUT_CSS, FAQ_RESPONSES, answer_query, check_compliance, get_land_types, load_rule_index, load_rules, zoning_source_mtime
+
 # Set page config
 st.set_page_config(page_title="AI-Urban Planning and Design", page_icon="🏠", layout="wide")
 
-# Custom CSS styling for chat input
-st.markdown("""
-    <style>
-    .stTextInput > div > div > input {
-        border: 3px solid black !important;
-        padding: 8px;
-        border-radius: 5px;
-        color: black !important;
-        background-color: white !important;
-    }
-    .stTextInput > div > div > input:focus {
-        border: 3px solid red !important;
-        outline: none !important;
-    }
-    </style>
-""", unsafe_allow_html=True)
-
-# Load zoning rules
-@st.cache_data
-def load_zoning_rules():
-    try:
-        return pd.read_csv("zoning_data.csv")
-    except FileNotFoundError:
-        st.error("⚠️ Zoning rules data file not found.")
-        return pd.DataFrame(columns=["land_type", "max_height", "pop_density_limit", "near_main_road", "setback_min", "floor_area_ratio"])
+# Custom CSS styling for chat input; re-emitted every run or Streamlit drops it from the page
+st.markdown(CHAT_INPUT_CSS, unsafe_allow_html=True)
 
-rules_df = load_zoning_rules()
+zoning_mtime = zoning_source_mtime()
+rules_df = load_rules(zoning_mtime)
+rules = load_rule_index(zoning_mtime)
 
 # Sidebar
 with st.sidebar:
     st.header("ℹ️ About Zoning Advisor")
     st.write("This tool helps developers and planners check zoning compliance.")
     st.subheader("📜 Zoning Rules Reference")
-    st.dataframe(rules_df)
+    # Only serialize the table when asked for; an expander would still send it on every rerun
+    if st.toggle("Show rules table", key="show_rules_table"):
+        st.dataframe(rules_df)
 
 # Page header
 st.title("🌆 AI-Urban Planning and Design")
@@ -50,7 +33,7 @@ with st.form("zoning_form"):
 
     col1, col2 = st.columns(2)
     with col1:
-        land_type = st.selectbox("Select Land Type", rules_df["land_type"].unique())
+        land_type = st.selectbox("Select Land Type", get_land_types(zoning_mtime))
         height = st.number_input("Building Height (meters)", min_value=0.0, value=10.0, step=0.5)
         population_density = st.number_input("Population Density (per km²)", min_value=0, value=100)
     with col2:
@@ -62,48 +45,29 @@ with st.form("zoning_form"):
 
 # Zoning Compliance Logic
 if submit_button:
-    start_time = time.time()
+    start_time = time.perf_counter()
 
-    if land_type not in rules_df["land_type"].values:
+    if land_type not in rules:
         st.error(f"❌ No zoning rules found for land type: {land_type}")
         st.stop()
 
-    selected_rule = rules_df[rules_df["land_type"] == land_type].iloc[0]
-    violations, compliances = [], []
-
-    # Compliance checks
-    if height > selected_rule["max_height"]:
-        violations.append(f"🚫 Height exceeds {selected_rule['max_height']} meters.")
-    else:
-        compliances.append(f"✅ Height of {height}m is within the allowed limit.")
-
-    if population_density > selected_rule["pop_density_limit"]:
-        violations.append(f"🚫 Density exceeds {selected_rule['pop_density_limit']} per km².")
-    else:
-        compliances.append(f"✅ Population density of {population_density} per km² is allowed.")
-
-    if near_main_road != selected_rule["near_main_road"]:
-        violations.append(f"🚫 Site should be {selected_rule['near_main_road']} to a main road.")
-    else:
-        compliances.append(f"✅ Proximity to main road is acceptable.")
-
-    if setback < selected_rule["setback_min"]:
-        violations.append(f"🚫 Setback is less than {selected_rule['setback_min']} meters.")
-    else:
-        compliances.append(f"✅ Setback of {setback}m is compliant.")
-
-    if floor_area_ratio > selected_rule["floor_area_ratio"]:
-        violations.append(f"🚫 FAR exceeds {selected_rule['floor_area_ratio']}.")
-    else:
-        compliances.append(f"✅ FAR of {floor_area_ratio} is compliant.")
+    inputs = {
+        "height": height,
+        "population_density": population_density,
+        "near_main_road": near_main_road,
+        "setback": setback,
+        "floor_area_ratio": floor_area_ratio,
+    }
+    violations, compliances = check_compliance(rules[land_type], inputs)
 
     compliance_percentage = (len(compliances) / (len(violations) + len(compliances)) * 100) if (violations or compliances) else 0
-    elapsed_time = round(time.time() - start_time, 2)
+    # The checks take microseconds, so report milliseconds
+    elapsed_ms = (time.perf_counter() - start_time) * 1e3
 
     # Display Results
     st.header("📊 Zoning Analysis Results")
     st.metric("Compliance Score", f"{compliance_percentage:.1f}%")
-    st.metric("Processing Time", f"{elapsed_time} sec")
+    st.metric("Processing Time", f"{elapsed_ms:.3f} ms")
 
     if not violations:
         st.success("✅ This plan complies with all zoning regulations.")
@@ -119,45 +83,51 @@ if submit_button:
             st.write(c)
 
     with st.expander("📋 Rule Used for Evaluation"):
-        st.dataframe(selected_rule.to_frame().T)
+        # Only the first row, which is the one load_rule_index() evaluated when the land type repeats
+        st.dataframe(rules_df.loc[[land_type]].iloc[:1])
 
 # --- Chatbot and FAQ Section in Tabs ---
-responses = {
-    "height limit": "🚧 The maximum building height allowed varies by zone.",
-    "population density": "🏙️ Population density limits help prevent overcrowding.",
-    "far": "📐 Floor Area Ratio defines the relationship between building size and land area.",
-    "setback": "🏠 Setbacks ensure buildings maintain proper distance from roads and neighboring properties.",
-    "exit": "👋 Goodbye! Chat session has ended."
-}
+# Only the most recent chat messages are kept in session state
+CHAT_HISTORY_LIMIT = 50
 
-st.header("🧠 AI Zoning Assistant")
+# Answer the submitted chat query and clear the input before the rerun
+def handle_chat_query():
+    user_query = st.session_state.chat_query
+    if not user_query.strip():
+        return
 
-tab1, tab2 = st.tabs(["💬 Chatbot", "📋 FAQ Help"])
+    bot_response = answer_query(user_query)
 
-with tab1:
+    st.session_state.chat_history.append(f"**You:** {user_query}")
+    st.session_state.chat_history.append(f"**Bot:** {bot_response}")
+    st.session_state.chat_query = ""
+
+# Chat UI as a fragment, so sending a message reruns only this panel instead of the whole page
+@st.fragment
+def chat_panel():
     if "chat_history" not in st.session_state:
-        st.session_state.chat_history = []
+        st.session_state.chat_history = collections.deque(maxlen=CHAT_HISTORY_LIMIT)
 
-    for msg in st.session_state.chat_history:
-        st.write(msg)
+    # Render the whole history as one markdown element instead of one element per message
+    if st.session_state.chat_history:
+        st.markdown("\n\n".join(st.session_state.chat_history))
 
-    user_query = st.text_input("Ask about zoning rules...", key=str(len(st.session_state.chat_history)))
-    
-    if st.button("Submit", key="submit_query"):
-        query_key = user_query.lower().strip()
-        bot_response = responses.get(query_key, "🤖 I can help with zoning regulations like height limits, FAR, setbacks, and density.")
-        
-        st.session_state.chat_history.append(f"**You:** {user_query}")
-        st.session_state.chat_history.append(f"**Bot:** {bot_response}")
-        st.rerun()
+    st.text_input("Ask about zoning rules...", key="chat_query", on_change=handle_chat_query)
+
+st.header("🧠 AI Zoning Assistant")
+
+tab1, tab2 = st.tabs(["💬 Chatbot", "📋 FAQ Help"])
+
+with tab1:
+    chat_panel()
 
 with tab2:
     st.subheader("📌 Common Questions")
-    question = st.selectbox("Choose a topic:", list(responses.keys()))
+    question = st.selectbox("Choose a topic:", list(FAQ_RESPONSES))
 
     if question:
-        st.write(f"**Bot:** {responses[question.lower()]}")
-        if question.lower() == "exit":
+        st.write(f"**Bot:** {FAQ_RESPONSES[question]}")
+        if question == "Exit":
             st.stop()
 
 st.markdown("---")
@@ -0,0 +1,177 @@
+import collections
+import os
+import re
+import streamlit as st
+import pandas as pd
+
+# Zoning rules source and schema
+ZONING_CSV = "zoning_data.csv"
+ZONING_PARQUET = "zoning_data.parquet"
+ZONING_COLUMNS = ["land_type", "max_height", "pop_density_limit", "near_main_road", "setback_min", "floor_area_ratio"]
+ZONING_DTYPES = {
+    "land_type": "category",
+    "max_height": "float64",
+    "pop_density_limit": "int32",
+    "near_main_road": "category",
+    "setback_min": "float64",
+    "floor_area_ratio": "float64",
+}
+
+# One land type's limits as native Python values
+Rule = collections.namedtuple("Rule", "max_height pop_density_limit near_main_road setback_min floor_area_ratio")
+
+# Compliance messages, in check order: height, density, main road, setback, FAR
+VIOLATION_TEMPLATES = (
+    "🚫 Height exceeds {max_height} meters.",
+    "🚫 Density exceeds {pop_density_limit} per km².",
+    "🚫 Site should be {near_main_road} to a main road.",
+    "🚫 Setback is less than {setback_min} meters.",
+    "🚫 FAR exceeds {floor_area_ratio}.",
+)
+COMPLIANCE_TEMPLATES = (
+    "✅ Height of {height}m is within the allowed limit.",
+    "✅ Population density of {population_density} per km² is allowed.",
+    "✅ Proximity to main road is acceptable.",
+    "✅ Setback of {setback}m is compliant.",
+    "✅ FAR of {floor_area_ratio} is compliant.",
+)
+
+# Custom CSS styling for chat input
+CHAT_INPUT_CSS = """
+    <style>
+    .stTextInput > div > div > input {
+        border: 3px solid black !important;
+        padding: 8px;
+        border-radius: 5px;
+        color: black !important;
+        background-color: white !important;
+    }
+    .stTextInput > div > div > input:focus {
+        border: 3px solid red !important;
+        outline: none !important;
+    }
+    </style>
+"""
+
+# Chatbot topics and answers
+RESPONSES = {
+    "height limit": "🚧 The maximum building height allowed varies by zone.",
+    "population density": "🏙️ Population density limits help prevent overcrowding.",
+    "far": "📐 Floor Area Ratio defines the relationship between building size and land area.",
+    "setback": "🏠 Setbacks ensure buildings maintain proper distance from roads and neighboring properties.",
+    "exit": "👋 Goodbye! Chat session has ended."
+}
+# FAQ display labels, built once; acronyms stay upper case
+FAQ_RESPONSES = {(k.upper() if k == "far" else k.title()): v for k, v in RESPONSES.items()}
+DEFAULT_RESPONSE = "🤖 I can help with zoning regulations like height limits, FAR, setbacks, and density."
+
+# Free-text phrases for each chat topic. "far" and "exit" are ordinary English words, so inside
+# a sentence FAR is only matched as the upper-case acronym and "exit" not at all.
+# Plural forms are listed explicitly since not every topic's plural just adds an "s".
+CHAT_TOPICS = {
+    "height limit": "height limit",
+    "height limits": "height limit",
+    "population density": "population density",
+    "population densities": "population density",
+    "setback": "setback",
+    "setbacks": "setback",
+    "floor area ratio": "far",
+    "floor area ratios": "far",
+}
+
+# Topic phrases compiled into one alternation so a query is matched in a single scan.
+# Longest phrases first so a plural wins over its singular and overlapping topics prefer the most specific one.
+CHAT_PATTERN = re.compile(r"\b(?:(?i:({}))|(FARs?))\b".format("|".join(re.escape(k) for k in sorted(CHAT_TOPICS, key=len, reverse=True))))
+
+# Write the columnar copy to a temp file first so readers never see a partial file.
+# The copy is stamped with the CSV's mtime, marking which version of the CSV it was built from.
+def write_zoning_parquet(df, source_mtime_ns):
+    tmp_path = f"{ZONING_PARQUET}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, engine="pyarrow", index=False)
+        os.utime(tmp_path, ns=(source_mtime_ns, source_mtime_ns))
+        os.replace(tmp_path, ZONING_PARQUET)
+    except (ImportError, OSError):
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+# Read the columnar copy when it was built from the current CSV, otherwise parse the CSV and refresh it.
+# The mtimes must match exactly: a CSV restored with an older mtime (cp -p, rsync -t, tar) still reloads.
+def read_zoning_table():
+    source_mtime_ns = os.stat(ZONING_CSV).st_mtime_ns
+    if os.path.exists(ZONING_PARQUET) and os.stat(ZONING_PARQUET).st_mtime_ns == source_mtime_ns:
+        try:
+            return pd.read_parquet(ZONING_PARQUET, columns=ZONING_COLUMNS, engine="pyarrow")
+        except Exception:
+            # Missing pyarrow or an unreadable file: fall back to the CSV, which also rewrites the copy
+            pass
+
+    df = pd.read_csv(ZONING_CSV, usecols=ZONING_COLUMNS, dtype=ZONING_DTYPES)
+    write_zoning_parquet(df, source_mtime_ns)
+    return df
+
+# Modification time of the zoning CSV, used as the cache key so edits on disk trigger a reload
+def zoning_source_mtime():
+    try:
+        return os.path.getmtime(ZONING_CSV)
+    except OSError:
+        return 0.0
+
+# Load zoning rules once per process and per CSV version; the table is read-only so sessions and pages can share it
+@st.cache_resource(max_entries=1)
+def load_rules(mtime):
+    try:
+        df = read_zoning_table()
+    except FileNotFoundError:
+        st.error("⚠️ Zoning rules data file not found.")
+        df = pd.DataFrame(columns=ZONING_COLUMNS).astype(ZONING_DTYPES)
+    # Index by land type so rule lookups are hash probes instead of column scans
+    return df.set_index("land_type")
+
+# Whole-meter limits as int, so messages read "10 meters" like the integer CSV columns did, not "10.0"
+def whole_or_float(value):
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+# Rules keyed by land type, so the submit path is one dict lookup plus attribute access.
+# The index keeps duplicate land types; the first row for each one wins.
+@st.cache_resource(max_entries=1)
+def load_rule_index(mtime):
+    df = load_rules(mtime)
+    return {
+        r.Index: Rule(whole_or_float(r.max_height), int(r.pop_density_limit), str(r.near_main_road), whole_or_float(r.setback_min), float(r.floor_area_ratio))
+        for r in df[~df.index.duplicated(keep="first")].itertuples()
+    }
+
+# Land type choices from the categorical index, deduplicated in file order like the rule lookup
+@st.cache_data(max_entries=1)
+def get_land_types(mtime):
+    return load_rules(mtime).index.unique().tolist()
+
+# Check development inputs against one Rule; returns (violations, compliances)
+def check_compliance(rule, inputs):
+    # One bit per check, set when it is violated, in the same order as the templates
+    mask = (
+        (inputs["height"] > rule.max_height)
+        | (inputs["population_density"] > rule.pop_density_limit) << 1
+        | (inputs["near_main_road"] != rule.near_main_road) << 2
+        | (inputs["setback"] < rule.setback_min) << 3
+        | (inputs["floor_area_ratio"] > rule.floor_area_ratio) << 4
+    )
+
+    limits = rule._asdict()
+    violations = [VIOLATION_TEMPLATES[i].format_map(limits) for i in range(len(VIOLATION_TEMPLATES)) if mask >> i & 1]
+    compliances = [COMPLIANCE_TEMPLATES[i].format_map(inputs) for i in range(len(COMPLIANCE_TEMPLATES)) if not mask >> i & 1]
+    return violations, compliances
+
+# Answer a free-text chat query with the first topic it mentions
+def answer_query(query):
+    # A query that is exactly a topic name keeps its exact-match answer, as before
+    query_key = query.strip().lower()
+    if query_key in RESPONSES:
+        return RESPONSES[query_key]
+
+    match = CHAT_PATTERN.search(query)
+    if not match:
+        return DEFAULT_RESPONSE
+    return RESPONSES[CHAT_TOPICS[match.group(1).lower()] if match.group(1) else "far"]